@@ -1,44 +1,58 @@
-from typing import Optional
+import json
 
 import pytest
-from dirty_equals import AnyThing, HasAttributes, IsInstance, IsList, IsPartialDict, IsStr, IsTuple
+from dirty_equals import IsInstance, IsList, IsStr, IsTuple
 
 from pydantic_core import SchemaError, SchemaValidator, ValidationError
 
 from ..conftest import Err, plain_repr
 from .test_typed_dict import Cls
 
+_validators = {}
+
+
+def _cached_validator(schema: dict, config: 'dict | None' = None) -> SchemaValidator:
+    """
+    Build a `SchemaValidator` once for each schema and config object, then reuse it.
+
+    Entries are keyed on identity and hold on to `schema` and `config`, so their ids can't be reused
+    by other objects while the entry exists.
+    """
+    key = id(schema), id(config)
+    entry = _validators.get(key)
+    if entry is not None and entry[0] is schema and entry[1] is config:
+        return entry[2]
+    v = SchemaValidator(schema, config)
+    _validators[key] = schema, config, v
+    return v
+
+
+def _none_or_ref(schema_ref: str) -> dict:
+    return {'type': 'union', 'choices': [{'type': 'none'}, {'type': 'recursive-ref', 'schema_ref': schema_ref}]}
+
+
+_SCHEMA_BRANCH_NULLABLE = {
+    'type': 'typed-dict',
+    'ref': 'Branch',
+    'fields': {
+        'name': {'schema': {'type': 'str'}},
+        'sub_branch': {
+            'schema': {
+                'type': 'default',
+                'schema': {'type': 'nullable', 'schema': {'type': 'recursive-ref', 'schema_ref': 'Branch'}},
+                'default': None,
+            }
+        },
+    },
+}
+
 
 def test_branch_nullable():
-    v = SchemaValidator(
-        {
-            'type': 'typed-dict',
-            'ref': 'Branch',
-            'fields': {
-                'name': {'schema': {'type': 'str'}},
-                'sub_branch': {
-                    'schema': {
-                        'type': 'default',
-                        'schema': {'type': 'nullable', 'schema': {'type': 'recursive-ref', 'schema_ref': 'Branch'}},
-                        'default': None,
-                    }
-                },
-            },
-        }
-    )
+    v = _cached_validator(_SCHEMA_BRANCH_NULLABLE)
     assert 'return_fields_set:false' in plain_repr(v)
-
-    assert v.validate_python({'name': 'root'}) == {'name': 'root', 'sub_branch': None}
     assert plain_repr(v).startswith('SchemaValidator(name="typed-dict",validator=RecursiveRef(RecursiveRefValidator{')
     assert ',slots=[TypedDict(TypedDictValidator{' in plain_repr(v)
 
-    assert v.validate_python({'name': 'root', 'sub_branch': {'name': 'b1'}}) == (
-        {'name': 'root', 'sub_branch': {'name': 'b1', 'sub_branch': None}}
-    )
-    assert v.validate_python({'name': 'root', 'sub_branch': {'name': 'b1', 'sub_branch': {'name': 'b2'}}}) == (
-        {'name': 'root', 'sub_branch': {'name': 'b1', 'sub_branch': {'name': 'b2', 'sub_branch': None}}}
-    )
-
 
 def test_unused_ref():
     v = SchemaValidator(
@@ -52,73 +66,136 @@ def test_unused_ref():
     assert v.validate_python({'name': 'root', 'other': '4'}) == {'name': 'root', 'other': 4}
 
 
+_SCHEMA_NULLABLE_ERROR = {
+    'ref': 'Branch',
+    'type': 'typed-dict',
+    'fields': {
+        'width': {'schema': {'type': 'int'}},
+        'sub_branch': {'schema': {'type': 'default', 'schema': _none_or_ref('Branch'), 'default': None}},
+    },
+}
+
+_EXPECTED_NULLABLE_ERRORS = [
+    {
+        'type': 'none_required',
+        'loc': ('sub_branch', 'none'),
+        'msg': 'Input should be None/null',
+        'input': {'width': 'wrong'},
+    },
+    {
+        'type': 'int_parsing',
+        'loc': ('sub_branch', 'typed-dict', 'width'),
+        'msg': 'Input should be a valid integer, unable to parse string as an integer',
+        'input': 'wrong',
+    },
+]
+
+
 def test_nullable_error():
-    v = SchemaValidator(
-        {
-            'ref': 'Branch',
-            'type': 'typed-dict',
-            'fields': {
-                'width': {'schema': {'type': 'int'}},
-                'sub_branch': {
-                    'schema': {
-                        'type': 'default',
-                        'schema': {
-                            'type': 'union',
-                            'choices': [{'type': 'none'}, {'type': 'recursive-ref', 'schema_ref': 'Branch'}],
-                        },
-                        'default': None,
-                    }
-                },
-            },
-        }
-    )
-    assert v.validate_python({'width': 123, 'sub_branch': {'width': 321}}) == (
-        {'width': 123, 'sub_branch': {'width': 321, 'sub_branch': None}}
-    )
+    v = _cached_validator(_SCHEMA_NULLABLE_ERROR)
     with pytest.raises(ValidationError) as exc_info:
-        assert v.validate_python({'width': 123, 'sub_branch': {'width': 'wrong'}})
-    assert exc_info.value.errors() == [
-        {
-            'type': 'none_required',
-            'loc': ('sub_branch', 'none'),
-            'msg': 'Input should be None/null',
-            'input': {'width': 'wrong'},
-        },
-        {
-            'type': 'int_parsing',
-            'loc': ('sub_branch', 'typed-dict', 'width'),
-            'msg': 'Input should be a valid integer, unable to parse string as an integer',
-            'input': 'wrong',
+        v.validate_python({'width': 123, 'sub_branch': {'width': 'wrong'}})
+    assert exc_info.value.errors() == _EXPECTED_NULLABLE_ERRORS
+
+
+_SCHEMA_BRANCH_LIST = {
+    'type': 'typed-dict',
+    'ref': 'BranchList',
+    'fields': {
+        'width': {'schema': {'type': 'int'}},
+        'branches': {
+            'schema': {
+                'type': 'default',
+                'schema': {'type': 'list', 'items_schema': {'type': 'recursive-ref', 'schema_ref': 'BranchList'}},
+                'default': None,
+            }
         },
-    ]
+    },
+}
+
+
+# each level nests the one before it, so the three depths share their sub-dicts
+_BRANCH_INNER = {'name': 'b2'}
+_BRANCH_MID = {'name': 'b1', 'sub_branch': _BRANCH_INNER}
+_BRANCH_OUTER = {'name': 'root', 'sub_branch': _BRANCH_MID}
+_EXPECTED_BRANCH_INNER = {'name': 'b2', 'sub_branch': None}
+_EXPECTED_BRANCH_MID = {'name': 'b1', 'sub_branch': _EXPECTED_BRANCH_INNER}
+_EXPECTED_BRANCH_OUTER = {'name': 'root', 'sub_branch': _EXPECTED_BRANCH_MID}
+_EXPECTED_BRANCH_LIST = {
+    'width': 1,
+    'branches': [{'width': 2, 'branches': None}, {'width': 3, 'branches': [{'width': 4, 'branches': None}]}],
+}
+
+_RECURSIVE_REF_CASES = [
+    pytest.param(_SCHEMA_BRANCH_NULLABLE, _BRANCH_INNER, _EXPECTED_BRANCH_INNER, id='branch-inner'),
+    pytest.param(_SCHEMA_BRANCH_NULLABLE, _BRANCH_MID, _EXPECTED_BRANCH_MID, id='branch-mid'),
+    pytest.param(_SCHEMA_BRANCH_NULLABLE, _BRANCH_OUTER, _EXPECTED_BRANCH_OUTER, id='branch-outer'),
+    pytest.param(
+        _SCHEMA_NULLABLE_ERROR,
+        {'width': 123, 'sub_branch': {'width': 321}},
+        {'width': 123, 'sub_branch': {'width': 321, 'sub_branch': None}},
+        id='nullable-error-valid',
+    ),
+    pytest.param(
+        _SCHEMA_BRANCH_LIST,
+        {'width': 1, 'branches': [{'width': 2}, {'width': 3, 'branches': [{'width': 4}]}]},
+        _EXPECTED_BRANCH_LIST,
+        id='branch-list',
+    ),
+]
+
+
+@pytest.mark.parametrize('schema,input_value,expected', _RECURSIVE_REF_CASES)
+def test_recursive_ref(schema, input_value, expected):
+    assert _cached_validator(schema).validate_python(input_value) == expected
 
 
-def test_list():
-    v = SchemaValidator(
-        {
-            'type': 'typed-dict',
-            'ref': 'BranchList',
-            'fields': {
-                'width': {'schema': {'type': 'int'}},
-                'branches': {
-                    'schema': {
-                        'type': 'default',
+@pytest.mark.parametrize(
+    'schema,input_json,expected',
+    [pytest.param(p.values[0], json.dumps(p.values[1]), p.values[2], id=p.id) for p in _RECURSIVE_REF_CASES],
+)
+def test_recursive_ref_json(schema, input_json, expected):
+    assert _cached_validator(schema).validate_json(input_json) == expected
+
+
+_SCHEMA_MULTIPLE_INTERTWINED = {
+    'ref': 'Foo',
+    'type': 'typed-dict',
+    'fields': {
+        'height': {'schema': {'type': 'int'}},
+        'bar': {
+            'schema': {
+                'ref': 'Bar',
+                'type': 'typed-dict',
+                'fields': {
+                    'width': {'schema': {'type': 'int'}},
+                    'bars': {
                         'schema': {
-                            'type': 'list',
-                            'items_schema': {'type': 'recursive-ref', 'schema_ref': 'BranchList'},
-                        },
-                        'default': None,
-                    }
+                            'type': 'default',
+                            'schema': {'type': 'list', 'items_schema': {'type': 'recursive-ref', 'schema_ref': 'Bar'}},
+                            'default': None,
+                        }
+                    },
+                    'foo': {'schema': {'type': 'default', 'schema': _none_or_ref('Foo'), 'default': None}},
                 },
-            },
-        }
-    )
-    assert v.validate_python({'width': 1, 'branches': [{'width': 2}, {'width': 3, 'branches': [{'width': 4}]}]}) == (
-        {
-            'width': 1,
-            'branches': [{'width': 2, 'branches': None}, {'width': 3, 'branches': [{'width': 4, 'branches': None}]}],
-        }
-    )
+            }
+        },
+    },
+}
+
+_MULTIPLE_INTERTWINED_INPUT = {
+    'height': 1,
+    'bar': {'width': 2, 'bars': [{'width': 3}], 'foo': {'height': 4, 'bar': {'width': 5, 'bars': [], 'foo': None}}},
+}
+_MULTIPLE_INTERTWINED_JSON = json.dumps(_MULTIPLE_INTERTWINED_INPUT)
+_EXPECTED_MULTIPLE_INTERTWINED = {
+    'height': 1,
+    'bar': {
+        'width': 2,
+        'bars': [{'width': 3, 'bars': None, 'foo': None}],
+        'foo': {'height': 4, 'bar': {'width': 5, 'bars': [], 'foo': None}},
+    },
+}
 
 
 def test_multiple_intertwined():
@@ -134,102 +211,57 @@ def test_multiple_intertwined():
         bar = Bar
     """
 
-    v = SchemaValidator(
-        {
-            'ref': 'Foo',
-            'type': 'typed-dict',
-            'fields': {
-                'height': {'schema': {'type': 'int'}},
-                'bar': {
-                    'schema': {
-                        'ref': 'Bar',
-                        'type': 'typed-dict',
-                        'fields': {
-                            'width': {'schema': {'type': 'int'}},
-                            'bars': {
-                                'schema': {
-                                    'type': 'default',
-                                    'schema': {
-                                        'type': 'list',
-                                        'items_schema': {'type': 'recursive-ref', 'schema_ref': 'Bar'},
-                                    },
-                                    'default': None,
-                                }
-                            },
-                            'foo': {
-                                'schema': {
-                                    'type': 'default',
-                                    'schema': {
-                                        'type': 'union',
-                                        'choices': [{'type': 'none'}, {'type': 'recursive-ref', 'schema_ref': 'Foo'}],
-                                    },
-                                    'default': None,
-                                }
-                            },
-                        },
-                    }
-                },
-            },
-        }
-    )
-    v.validate_python(
-        {
-            'height': 1,
-            'bar': {
-                'width': 2,
-                'bars': [{'width': 3}],
-                'foo': {'height': 4, 'bar': {'width': 5, 'bars': [], 'foo': None}},
-            },
-        }
-    )
+    v = _cached_validator(_SCHEMA_MULTIPLE_INTERTWINED)
+    assert v.validate_python(_MULTIPLE_INTERTWINED_INPUT) == _EXPECTED_MULTIPLE_INTERTWINED
 
 
-def test_model_class():
-    class Branch:
-        # this is not required, but it avoids `__fields_set__` being included in `__dict__`
-        __slots__ = '__dict__', '__fields_set__'
-        # these are here just as decoration
-        width: int
-        branch: Optional['Branch']  # noqa F821
+def test_multiple_intertwined_json():
+    v = _cached_validator(_SCHEMA_MULTIPLE_INTERTWINED)
+    assert v.validate_json(_MULTIPLE_INTERTWINED_JSON) == _EXPECTED_MULTIPLE_INTERTWINED
 
-    v = SchemaValidator(
-        {
-            'type': 'new-class',
-            'ref': 'Branch',
-            'cls': Branch,
-            'schema': {
-                'type': 'typed-dict',
-                'return_fields_set': True,
-                'fields': {
-                    'width': {'schema': {'type': 'int'}},
-                    'branch': {
-                        'schema': {
-                            'type': 'default',
-                            'schema': {
-                                'type': 'union',
-                                'choices': [{'type': 'none'}, {'type': 'recursive-ref', 'schema_ref': 'Branch'}],
-                            },
-                            'default': None,
-                        }
-                    },
-                },
-            },
-        }
-    )
-    m1: Branch = v.validate_python({'width': '1'})
-    assert isinstance(m1, Branch)
+
+class _BranchModel:
+    # this is not required, but it avoids `__fields_set__` being included in `__dict__`
+    __slots__ = '__dict__', '__fields_set__'
+    # these are here just as decoration
+    width: int
+    branch: '_BranchModel | None'
+
+
+_SCHEMA_MODEL_CLASS = {
+    'type': 'new-class',
+    'ref': 'Branch',
+    'cls': _BranchModel,
+    'schema': {
+        'type': 'typed-dict',
+        'return_fields_set': True,
+        'fields': {
+            'width': {'schema': {'type': 'int'}},
+            'branch': {'schema': {'type': 'default', 'schema': _none_or_ref('Branch'), 'default': None}},
+        },
+    },
+}
+
+_EXPECTED_M1 = {'width': 1, 'branch': None}
+_EXPECTED_M2_BRANCH = {'width': 20, 'branch': None}
+
+
+@pytest.fixture(scope='session')
+def branch_model_validator() -> SchemaValidator:
+    return SchemaValidator(_SCHEMA_MODEL_CLASS)
+
+
+def test_model_class(branch_model_validator: SchemaValidator):
+    m1: _BranchModel = branch_model_validator.validate_python({'width': '1'})
+    assert isinstance(m1, _BranchModel)
     assert m1.__fields_set__ == {'width'}
-    assert m1.__dict__ == {'width': 1, 'branch': None}
-    assert m1.width == 1
-    assert m1.branch is None
+    assert vars(m1) == _EXPECTED_M1
 
-    m2: Branch = v.validate_python({'width': '10', 'branch': {'width': 20}})
-    assert isinstance(m2, Branch)
+    m2: _BranchModel = branch_model_validator.validate_python({'width': '10', 'branch': {'width': 20}})
+    assert isinstance(m2, _BranchModel)
     assert m2.__fields_set__ == {'width', 'branch'}
-    assert m2.width == 10
-    assert isinstance(m2.branch, Branch)
-    assert m2.branch.width == 20
-    assert m2.branch.branch is None
+    assert vars(m2) == {'width': 10, 'branch': IsInstance(_BranchModel)}
+    assert vars(m2.branch) == _EXPECTED_M2_BRANCH
 
 
 def test_invalid_schema():
@@ -257,84 +289,96 @@ def test_invalid_schema():
         )
 
 
-def test_outside_parent():
-    v = SchemaValidator(
-        {
-            'type': 'typed-dict',
-            'fields': {
-                'tuple1': {
-                    'schema': {
-                        'type': 'tuple',
-                        'mode': 'positional',
-                        'items_schema': [{'type': 'int'}, {'type': 'int'}, {'type': 'str'}],
-                        'ref': 'tuple-iis',
-                    }
-                },
-                'tuple2': {'schema': {'type': 'recursive-ref', 'schema_ref': 'tuple-iis'}},
-            },
-        }
-    )
+_SCHEMA_OUTSIDE_PARENT = {
+    'type': 'typed-dict',
+    'fields': {
+        'tuple1': {
+            'schema': {
+                'type': 'tuple',
+                'mode': 'positional',
+                'items_schema': [{'type': 'int'}, {'type': 'int'}, {'type': 'str'}],
+                'ref': 'tuple-iis',
+            }
+        },
+        'tuple2': {'schema': {'type': 'recursive-ref', 'schema_ref': 'tuple-iis'}},
+    },
+}
 
-    assert v.validate_python({'tuple1': [1, '1', 'frog'], 'tuple2': [2, '2', 'toad']}) == {
-        'tuple1': (1, 1, 'frog'),
-        'tuple2': (2, 2, 'toad'),
-    }
 
+_OUTSIDE_PARENT_TUPLE_INPUT = {'tuple1': (1, '1', 'frog'), 'tuple2': (2, '2', 'toad')}
+_OUTSIDE_PARENT_LIST_INPUT = {'tuple1': [1, '1', 'frog'], 'tuple2': [2, '2', 'toad']}
+_OUTSIDE_PARENT_JSON = json.dumps(_OUTSIDE_PARENT_LIST_INPUT)
+_EXPECTED_OUTSIDE_PARENT = {'tuple1': (1, 1, 'frog'), 'tuple2': (2, 2, 'toad')}
 
-def test_recursion_branch():
-    v = SchemaValidator(
-        {
-            'type': 'typed-dict',
-            'ref': 'Branch',
-            'fields': {
-                'name': {'schema': {'type': 'str'}},
-                'branch': {
-                    'schema': {
-                        'type': 'default',
-                        'schema': {'type': 'nullable', 'schema': {'type': 'recursive-ref', 'schema_ref': 'Branch'}},
-                        'default': None,
-                    }
-                },
-            },
+
+@pytest.mark.parametrize(
+    'input_value', [_OUTSIDE_PARENT_TUPLE_INPUT, _OUTSIDE_PARENT_LIST_INPUT], ids=['tuple', 'list']
+)
+def test_outside_parent(input_value):
+    v = _cached_validator(_SCHEMA_OUTSIDE_PARENT)
+
+    assert v.validate_python(input_value) == _EXPECTED_OUTSIDE_PARENT
+
+
+def test_outside_parent_json():
+    v = _cached_validator(_SCHEMA_OUTSIDE_PARENT)
+
+    assert v.validate_json(_OUTSIDE_PARENT_JSON) == _EXPECTED_OUTSIDE_PARENT
+
+
+_SCHEMA_RECURSION_BRANCH = {
+    'type': 'typed-dict',
+    'ref': 'Branch',
+    'fields': {
+        'name': {'schema': {'type': 'str'}},
+        'branch': {
+            'schema': {
+                'type': 'default',
+                'schema': {'type': 'nullable', 'schema': {'type': 'recursive-ref', 'schema_ref': 'Branch'}},
+                'default': None,
+            }
         },
-        {'from_attributes': True},
-    )
-    assert v.validate_python({'name': 'root'}) == {'name': 'root', 'branch': None}
-    assert v.validate_python({'name': 'root', 'branch': {'name': 'b1', 'branch': None}}) == {
-        'name': 'root',
-        'branch': {'name': 'b1', 'branch': None},
-    }
+    },
+}
+
+_CYCLIC_BRANCH = {'name': 'recursive'}
+_CYCLIC_BRANCH['branch'] = _CYCLIC_BRANCH
+
+_RECURSION_BRANCH_CASES = [
+    ({'name': 'root'}, {'name': 'root', 'branch': None}),
+    (
+        {'name': 'root', 'branch': {'name': 'b1', 'branch': None}},
+        {'name': 'root', 'branch': {'name': 'b1', 'branch': None}},
+    ),
+    (Cls(name='root', branch=Cls(name='b1', branch=None)), {'name': 'root', 'branch': {'name': 'b1', 'branch': None}}),
+]
 
-    data = Cls(name='root')
-    data.branch = Cls(name='b1', branch=None)
-    assert v.validate_python(data) == {'name': 'root', 'branch': {'name': 'b1', 'branch': None}}
 
-    b = {'name': 'recursive'}
-    b['branch'] = b
+@pytest.fixture(scope='session')
+def branch_attributes_validator() -> SchemaValidator:
+    return SchemaValidator(_SCHEMA_RECURSION_BRANCH, {'from_attributes': True})
+
+
+@pytest.mark.parametrize('input_value,expected', _RECURSION_BRANCH_CASES, ids=['root', 'nested', 'attributes'])
+def test_recursion_branch(branch_attributes_validator: SchemaValidator, input_value, expected):
+    assert branch_attributes_validator.validate_python(input_value) == expected
+
+
+def test_recursion_branch_cyclic(branch_attributes_validator: SchemaValidator):
     with pytest.raises(ValidationError) as exc_info:
-        assert v.validate_python(b)
+        branch_attributes_validator.validate_python(_CYCLIC_BRANCH)
     assert exc_info.value.title == 'typed-dict'
-    assert exc_info.value.errors() == [
-        {
-            'type': 'recursion_loop',
-            'loc': ('branch',),
-            'msg': 'Recursion error - cyclic reference detected',
-            'input': {'name': 'recursive', 'branch': IsPartialDict(name='recursive')},
-        }
-    ]
+    [error] = exc_info.value.errors()
+    assert error.pop('input') is _CYCLIC_BRANCH
+    assert error == {'type': 'recursion_loop', 'loc': ('branch',), 'msg': 'Recursion error - cyclic reference detected'}
 
     data = Cls(name='root')
     data.branch = data
     with pytest.raises(ValidationError) as exc_info:
-        v.validate_python(data)
-    assert exc_info.value.errors() == [
-        {
-            'type': 'recursion_loop',
-            'loc': ('branch',),
-            'msg': 'Recursion error - cyclic reference detected',
-            'input': HasAttributes(name='root', branch=AnyThing()),
-        }
-    ]
+        branch_attributes_validator.validate_python(data)
+    [error] = exc_info.value.errors()
+    assert error.pop('input') is data
+    assert error == {'type': 'recursion_loop', 'loc': ('branch',), 'msg': 'Recursion error - cyclic reference detected'}
 
 
 def test_recursive_list():
@@ -347,7 +391,7 @@ def test_recursive_list():
     data = list()
     data.append(data)
     with pytest.raises(ValidationError) as exc_info:
-        assert v.validate_python(data)
+        v.validate_python(data)
     assert exc_info.value.title == 'list[...]'
     assert exc_info.value.errors() == [
         {